@@ -93,14 +93,21 @@ def print_config(data):
     Imprime los datos básicos de configuración
     """
     logging.basicConfig(stream=sys.stdout, level=logging.INFO)
-    logging.info('|============  Configuración  ============')
-    logging.info('| Certificado:   %s', data['certificate'])
-    logging.info('| Clave Privada: %s', data['private_key'])
-    logging.info('| Frase Secreta: %s', '****' if data['passphrase'] else None)
-    logging.info('| WSAA WSDL:     %s', data['wsdl'])
-    logging.info('| WS:            %s', data['web_service'])
-    logging.info('| WS WSDL:       %s', data['ws_wsdl'])
-    logging.info('|=================  ---  =================')
+
+    # Emito la configuración en una única llamada al logger para adquirir el
+    # lock una sola vez, con sustitución diferida de argumentos
+    logging.info(
+        '\n'.join(('|============  Configuración  ============',
+                   '| Certificado:   %s',
+                   '| Clave Privada: %s',
+                   '| Frase Secreta: %s',
+                   '| WSAA WSDL:     %s',
+                   '| WS:            %s',
+                   '| WS WSDL:       %s',
+                   '|=================  ---  =================')),
+        data['certificate'], data['private_key'],
+        '****' if data['passphrase'] else None, data['wsdl'],
+        data['web_service'], data['ws_wsdl'])
 
 
 # CLI
@@ -258,10 +265,11 @@ def wsfe_parser(base):
                'ultimo_autorizado', 'cantidad_registros',
                'consultar_comprobante')
 
-    # Tupla de parámetros habilitados
+    # Tupla de parámetros habilitados. La opción todos consulta de forma
+    # concurrente todos los parámetros que no requieren datos adicionales
     parameter = ('comprobante', 'concepto', 'documento', 'iva', 'monedas',
                  'opcional', 'tributos', 'puntos_venta', 'cotizacion',
-                 'tipos_paises')
+                 'tipos_paises', 'todos')
 
     exclusive.add_argument(
         '--comprobante',
@@ -128,23 +128,23 @@ def check_parser(args, extra):
     mediante argparse
     """
     if args.prog == 'ws_sr_padron.py':
-        if args.scope == '100' and not args.table or \
-           args.scope != '100' and args.table:
+        if args.alcance == '100' and not args.tabla or \
+           args.alcance != '100' and args.tabla:
             raise ValueError('el agumento --tabla sólo es válido con '
                              '--alcance 100')
-        elif args.scope == '100' and args.person or \
-             args.scope != '100' and not args.person:
+        elif args.alcance == '100' and args.persona or \
+             args.alcance != '100' and not args.persona:
             raise ValueError('el argumento --persona sólo es válido con '
                              '--alcance 4, 5 o 10')
     elif args.prog == 'wsfe.py':
-        if args.parameter == 'cotizacion':
+        if args.parametro == 'cotizacion':
             if '--id' not in extra:
                 raise ValueError('debe indicar el ID de la moneda a '
                                  'cotizar: --id ID')
             elif len(extra) != 2:
                 raise ValueError('debe indicar un único ID')
-        if args.voucher in ('solicitar', 'ultimo_autorizado',
-                            'cantidad_registros', 'consultar_comprobante'):
+        if args.comprobante in ('solicitar', 'ultimo_autorizado',
+                                'cantidad_registros', 'consultar_comprobante'):
             if '--tipo' not in extra:
                 raise ValueError('debe inficar el tipo de comprobante: '
                                  '--tipo CAE o CAEA')
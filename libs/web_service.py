@@ -14,10 +14,8 @@ Módulo con clases para la gestión de Web Services SOAP
 """
 
 import logging
-
-from requests import Session
-from zeep import Client, helpers
-from zeep.transports import Transport
+import threading
+from time import monotonic
 
 __author__ = 'Alejandro Naifuino (alenaifuino@gmail.com)'
 __copyright__ = 'Copyright (C) 2017 Alejandro Naifuino'
@@ -38,32 +36,48 @@ class WSBase():
         self.token = None
         self.sign = None
         self.output = None
+        self._dummy_cache = None
 
-    def dummy(self, name='dummy'):
+    def dummy(self, name='dummy', ttl=30):
         """
         Verifica estado y disponibilidad de los elementos principales del
-        servicio de AFIP: aplicación, autenticación y base de datos
+        servicio de AFIP: aplicación, autenticación y base de datos. El
+        resultado se reutiliza durante ttl segundos para no repetir la
+        consulta en operaciones en lote
         """
+        # Reutilizo el resultado previo si este no superó el TTL
+        if self._dummy_cache and monotonic() - self._dummy_cache[0] < ttl:
+            return self._dummy_cache[1]
+
         # Obtengo la respuesta de AFIP
         response = soap_connect(self.ws_wsdl, name)
 
         # Armo un diccionario con el estado de cada componente
         status = {key.lower(): value for (key, value) in response.items()}
 
-        # Si estoy en modo debug imprimo el estado de los servidores
+        # Si estoy en modo debug imprimo el estado de los servidores en una
+        # única llamada al logger con sustitución diferida de argumentos
         if self.debug:
-            logging.info('|===========  Servidores AFIP  ===========')
-            logging.info('| AppServer: ' + status['appserver'])
-            logging.info('| AuthServer: ' + status['authserver'])
-            logging.info('| DBServer: ' + status['dbserver'])
-            logging.info('|=================  ---  =================')
-
-        # Devuelvo True si alguno de los componentes no está disponible
+            logging.info(
+                '\n'.join(('|===========  Servidores AFIP  ===========',
+                           '| AppServer: %s',
+                           '| AuthServer: %s',
+                           '| DBServer: %s',
+                           '|=================  ---  =================')),
+                status['appserver'], status['authserver'], status['dbserver'])
+
+        # Establezco down en True si alguno de los componentes no está
+        # disponible
+        down = False
         for value in status.values():
             if value != 'OK':
-                return True
+                down = True
+                break
 
-        return False
+        # Almaceno el resultado junto con el momento de la consulta
+        self._dummy_cache = (monotonic(), down)
+
+        return down
 
     def set_output_path(self, output_file):
         """
@@ -84,21 +98,51 @@ class WSBase():
         self.output = os.path.join(output_dir, output_file)
 
 
-def soap_connect(wsdl, name, parameters=None, timeout=30):
+# Almacén thread-local con los clientes SOAP ya instanciados por WSDL para
+# evitar parsear el WSDL y establecer una nueva conexión TLS en cada
+# requerimiento. Cada thread mantiene sus propios clientes ya que la Session
+# de requests no es thread-safe
+_clients = threading.local()
+
+
+def get_client(wsdl, timeout=30):
     """
-    Conecta al Web Service SOAP de AFIP requerido con los parámetros
-    suministrados
+    Devuelve el cliente SOAP para el WSDL requerido, reutilizando el
+    instanciado previamente por el thread actual si este existe
     """
-    # Instancio Session para validar la conexión SSL, de esta manera la
-    # información se mantiene de manera persistente
-    session = Session()
+    from requests import Session
+    from zeep import Client
+    from zeep.transports import Transport
+
+    # Obtengo el diccionario de clientes del thread actual
+    clients = getattr(_clients, 'cache', None)
+    if clients is None:
+        clients = _clients.cache = {}
+
+    # Instancio el cliente sólo si no fue instanciado previamente
+    if wsdl not in clients:
+        # Instancio Session para validar la conexión SSL, de esta manera la
+        # información se mantiene de manera persistente
+        session = Session()
 
-    # Instancio Transport con la información de sesión y el timeout a
-    # utilizar en la conexión
-    transport = Transport(session=session, timeout=timeout)
+        # Instancio Transport con la información de sesión y el timeout a
+        # utilizar en la conexión
+        transport = Transport(session=session, timeout=timeout)
 
-    # Instancio Client con los datos del wsdl y de transporte
-    client = Client(wsdl=wsdl, transport=transport)
+        # Instancio Client con los datos del wsdl y de transporte
+        clients[wsdl] = Client(wsdl=wsdl, transport=transport)
+
+    return clients[wsdl]
+
+
+def soap_connect(wsdl, name, parameters=None, timeout=30, serialize=True):
+    """
+    Conecta al Web Service SOAP de AFIP requerido con los parámetros
+    suministrados. Con serialize=False devuelve la respuesta cruda de zeep
+    sin convertirla a tipos nativos
+    """
+    # Obtengo el cliente SOAP del WSDL requerido
+    client = get_client(wsdl, timeout)
 
     # Obtengo la respuesta de AFIP según el tipo de método y los parámetros
     # suministrados
@@ -107,5 +151,10 @@ def soap_connect(wsdl, name, parameters=None, timeout=30):
     else:
         response = getattr(client.service, name)(**parameters)
 
-    # Serializo y devuelvo la respuesta de AFIP
-    return helpers.serialize_object(response)
+    # Serializo la respuesta de AFIP a tipos nativos si así se requiere
+    if serialize:
+        from zeep import helpers
+
+        response = helpers.serialize_object(response)
+
+    return response
@@ -104,9 +104,11 @@ class WSAA(web_service.WSBase):
 
         # Muestro el TRA si estoy en modo debug
         if self.debug:
-            logging.info('|=================  TRA  =================')
-            logging.info('|\n' + str(tra, 'utf-8').strip('\n'))
-            logging.info('|=================  ---  =================')
+            logging.info(
+                '\n'.join(('|=================  TRA  =================',
+                           '|\n%s',
+                           '|=================  ---  =================')),
+                str(tra, 'utf-8').strip('\n'))
 
         return tra
 
@@ -139,9 +141,10 @@ class WSAA(web_service.WSBase):
         # Muestro el mensaje de éxito y no el mensaje CMS propiamente dicho
         # ya que el mismo no aporta nada al debug
         if self.debug:
-            logging.info('|=================  CMS  =================')
-            logging.info('| Mensaje CMS en Base64 creado exitosamente')
-            logging.info('|=================  ---  =================')
+            logging.info(
+                '\n'.join(('|=================  CMS  =================',
+                           '| Mensaje CMS en Base64 creado exitosamente',
+                           '|=================  ---  =================')))
 
         return cms
 
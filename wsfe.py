@@ -60,12 +60,13 @@ Especificación Técnica v2.10 en:
 http://www.afip.gob.ar/fe/documentos/manual_desarrollador_COMPG_v2_10.pdf
 """
 
-from json import dumps
+from copy import deepcopy
+from decimal import Decimal
+from sys import intern
 
-from zeep import exceptions
+import orjson
 
 from libs import utility, web_service
-from wsaa import WSAA
 
 __author__ = 'Alejandro Naifuino (alenaifuino@gmail.com)'
 __copyright__ = 'Copyright (C) 2017 Alejandro Naifuino'
@@ -73,6 +74,185 @@ __license__ = 'GPL 3.0'
 __version__ = '0.7.1'
 
 
+# Métodos de parámetros soportados por el Web Service de Factura Electrónica
+_PARAM_METHODS = {
+    'comprobante': 'FEParamGetTiposCbte',
+    'concepto': 'FEParamGetTiposConcepto',
+    'documento': 'FEParamGetTiposDoc',
+    'iva': 'FEParamGetTiposIva',
+    'monedas': 'FEParamGetTiposMonedas',
+    'opcional': 'FEParamGetTiposOpcional',
+    'tributos': 'FEParamGetTiposTributos',
+    'puntos_venta': 'FEParamGetPtosVenta',
+    'cotizacion': 'FEParamGetCotizacion',
+    'tipos_paises': 'FEParamGetTiposPaises',
+}
+
+# Métodos de comprobantes soportados por el Web Service de Factura Electrónica
+_FE_METHODS = {
+    'solicitar': 'FECAESolicitar',
+    'consultar': 'FECAEAConsultar',
+    'informar_sin_movimiento': 'FECAEASinMovimientoInformar',
+    'consultar_sin_movimiento': 'FECAEASinMovimientoConsultar',
+    'informar_comprobantes': 'FECAEARegInformativo',
+    'ultimo_autorizado': 'FECompUltimoAutorizado',
+    'cantidad_registros': 'FECompTotXRequest',
+    'consultar_comprobante': 'FECompConsultar',
+}
+
+# Plantillas con los parámetros adicionales que requiere cada método de
+# comprobantes. Los métodos que no figuran (FECompTotXRequest) sólo requieren
+# los parámetros de autenticación
+_FE_EXTRA_TEMPLATES = {
+    'FECAESolicitar': {
+        'FeCAEReq': {
+            'FeCabReq': {
+                'CantReg': '',
+                'PtoVta': '',
+                'CbteTipo': '',
+            },
+            'FeDetReq': {
+                'FECAEDetRequest': {
+                    'Concepto': '',
+                    'DocTipo': '',
+                    'DocNro': '',
+                    'CbteDesde': '',
+                    'CbteHasta': '',
+                    'CbteFch': '',
+                    'ImpTotal': '',
+                    'ImpTotConc': '',
+                    'ImpNeto': '',
+                    'ImpOpEx': '',
+                    'ImpTrib': '',
+                    'ImpIVA': '',
+                    'FchServDesde': '',
+                    'FchServHasta': '',
+                    'FchVtoPago': '',
+                    'MonId': '',
+                    'MonCotiz': '',
+                    'CbtesAsoc': {
+                        'CbteAsoc': {
+                            'Tipo': '',
+                            'PtoVta': '',
+                            'Nro': ''
+                        }
+                    },
+                    'Tributos': {
+                        'Tributo': {
+                            'Id': '',
+                            'Desc': '',
+                            'BaseImp': '',
+                            'Alic': '',
+                            'Importe': '',
+                        }
+                    },
+                    'Iva': {
+                        'AlicIva': {
+                            'Id': '',
+                            'BaseImp': '',
+                            'Importe': '',
+                        }
+                    },
+                    'Opcionales': {
+                        'Opcional': {
+                            'Id': '',
+                            'Valor': '',
+                        }
+                    }
+                }
+            }
+        }
+    },
+    'FECAEASolicitar': {
+        'Periodo': '',
+        'Orden': ''
+    },
+    'FECAEAConsultar': {
+        'Periodo': '',
+        'Orden': ''
+    },
+    'FECAEASinMovimientoInformar': {
+        'PtoVta': '',
+        'CAEA': ''
+    },
+    'FECAEARegInformativo': {
+        'FeCAEARegInfReq': {
+            'FeCabReq': {
+                'CantReg': '',
+                'PtoVta': '',
+                'CbteTipo': ''
+            },
+            'FeDetReq': {
+                'FECAEADetRequest': {
+                    'Concepto': '',
+                    'DocTipo': '',
+                    'DocNro': '',
+                    'CbteDesde': '',
+                    'CbteHasta': '',
+                    'CbteFch': '',
+                    'ImpTotal': '',
+                    'ImpTotConc': '',
+                    'ImpNeto': '',
+                    'ImpOpEx': '',
+                    'ImpIVA': '',
+                    'ImpTrib': '',
+                    'FchServDesde': '',
+                    'FchServHasta': '',
+                    'FchVtoPago': '',
+                    'MonId': '',
+                    'MonCotiz': '',
+                    'CbtesAsoc': {
+                        'CbteAsoc': {
+                            'Tipo': '',
+                            'PtoVta': '',
+                            'Nro': ''
+                        }
+                    },
+                    'Tributos': {
+                        'Tributo': {
+                            'Id': '',
+                            'Desc': '',
+                            'BaseImp': '',
+                            'Alic': '',
+                            'Importe': ''
+                        }
+                    },
+                    'Iva': {
+                        'AlicIva': {
+                            'Id': '',
+                            'BaseImp': '',
+                            'Importe': ''
+                        }
+                    },
+                    'Opcionales': {
+                        'Opcional': {
+                            'Id': '',
+                            'Valor': ''
+                        }
+                    },
+                    'CAEA': ''
+                }
+            }
+        }
+    },
+    'FECAEASinMovimientoConsultar': {
+        'CAEA': '',
+        'PtoVta': ''
+    },
+    'FECompUltimoAutorizado': {
+        'PtoVta': '',
+        'CbteTipo': ''
+    },
+    'FECompConsultar': {
+        'FeCompConsReq': {
+            'CbteTipo': '',
+            'CbteNro': '',
+            'PtoVta': ''
+        }
+    },
+}
+
+
 class WSFE(web_service.WSBase):
     """
     Clase que se usa de interfaz para el Web Service de Factura Electrónica
@@ -84,7 +264,11 @@ class WSFE(web_service.WSBase):
                          config['web_service'])
         self.cuit = utility.get_cuit()
         self.request = 'comprobante' if config['comprobante'] else 'parametro'
-        self.option = config[self.request]
+
+        # Interno la opción para que las búsquedas en los mapas de métodos se
+        # resuelvan comparando punteros con las claves ya internadas
+        self.option = intern(config[self.request])
+        self._auth_params = None
 
         # Establezco el ID de la moneda a cotizar si el método es cotizacion
         if self.request == 'parametro' and self.option == 'cotizacion':
@@ -96,256 +280,141 @@ class WSFE(web_service.WSBase):
                                'cantidad_registros', 'consultar_comprobante'):
                 self.voucher_type = config['tipo']
 
-    def __request_param(self):
-        """
-        Método genérico que realiza la solicitud a los métodos de AFIP que
-        devuelven parámetros
-        """
-        # Métodos soportados por el web service de Factura Electrónica
-        methods = {
-            'comprobante': 'FEParamGetTiposCbte',
-            'concepto': 'FEParamGetTiposConcepto',
-            'documento': 'FEParamGetTiposDoc',
-            'iva': 'FEParamGetTiposIva',
-            'monedas': 'FEParamGetTiposMonedas',
-            'opcional': 'FEParamGetTiposOpcional',
-            'tributos': 'FEParamGetTiposTributos',
-            'puntos_venta': 'FEParamGetPtosVenta',
-            'cotizacion': 'FEParamGetCotizacion',
-            'tipos_paises': 'FEParamGetTiposPaises',
-        }
-
-        # Valido el nombre del método solicitado y lo asigno si es válido
-        if self.option not in methods.keys():
-            raise SystemExit('El parámetro no está soportado por el Web '
-                             'Service de Factura Electrónica')
+        # Establezco el lugar donde se almacenan los datos; como la opción no
+        # cambia durante la vida del objeto lo defino una única vez. Para la
+        # opción todos la salida se compone de un archivo por parámetro por lo
+        # que sólo defino el directorio
+        if self.option == 'todos':
+            self.set_output_path(output_file='')
         else:
-            method = methods[self.option]
+            self.set_output_path(output_file=self.option + '.json')
 
-        # Establezco el lugar donde se almacenan los datos
-        self.set_output_path(output_file=self.option + '.json')
+    def set_credentials(self, token, sign):
+        """
+        Establece el token y sign obtenidos del WSAA y arma el diccionario
+        de autenticación que requieren los métodos de Factura Electrónica
+        """
+        self.token = token
+        self.sign = sign
 
-        # Defino los parámetros de autenticación
-        params = {
+        # Armo el diccionario de autenticación una única vez ya que el token,
+        # el sign y la CUIT no cambian durante la vida del objeto
+        self._auth_params = {
             'Auth': {
-                'Token': self.token,
-                'Sign': self.sign,
+                'Token': token,
+                'Sign': sign,
                 'Cuit': self.cuit
             }
         }
 
-        # Agrego los parámetros adicionales para el método cotizacion
-        if self.option == 'cotizacion':
-            params.update({'MonId': self.currency_id})
+    def __get_param(self, option):
+        """
+        Solicita el parámetro definido en option a AFIP y almacena la
+        respuesta en formato JSON
+        """
+        from os import path
 
-        # Obtengo la respuesta del WSDL de AFIP
+        from zeep import exceptions
+        from zeep.xsd.valueobjects import CompoundValue
+
+        # Conversor de los objetos de zeep que orjson no puede serializar de
+        # forma nativa; los tipos se resuelven una única vez por solicitud y
+        # no en cada nodo de la respuesta
+        def zeep_default(value):
+            if isinstance(value, CompoundValue):
+                return dict(value.__values__)
+            if isinstance(value, Decimal):
+                return str(value)
+
+            raise TypeError
+
+        # Obtengo el nombre del método según la opción solicitada
+        method = _PARAM_METHODS[option]
+
+        # Defino los parámetros de autenticación junto con el ID de la
+        # moneda para el método cotizacion
+        if option == 'cotizacion':
+            params = {**self._auth_params, 'MonId': self.currency_id}
+        else:
+            params = {**self._auth_params}
+
+        # Obtengo la respuesta cruda del WSDL de AFIP; la conversión a tipos
+        # nativos la realiza orjson al serializar
         try:
-            response = web_service.soap_connect(self.ws_wsdl, method, params)
+            response = web_service.soap_connect(self.ws_wsdl, method, params,
+                                                serialize=False)
         except exceptions.Fault as error:
-            raise SystemExit('Error: {} {}'.format(error.code, error.message))
+            raise SystemExit(f'Error: {error.code} {error.message}')
 
-        # Lo transformo a JSON
-        json_response = dumps(response, indent=2, ensure_ascii=False)
+        # Defino el archivo de salida del parámetro solicitado
+        output = path.join(path.dirname(self.output), option + '.json')
 
-        # Genero el archivo con la respuesta de AFIP
-        with open(self.output, 'w') as file:
-            file.write(json_response)
+        # Genero el archivo con la respuesta de AFIP en formato JSON
+        with open(output, 'wb') as file:
+            file.write(orjson.dumps(
+                response,
+                default=zeep_default,
+                option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
 
-        return json_response
+    def __request_all_params(self):
+        """
+        Solicita de forma concurrente todos los parámetros de AFIP que no
+        requieren datos adicionales
+        """
+        from concurrent.futures import ThreadPoolExecutor
 
-    def __request_fe(self):
+        # Excluyo cotizacion ya que requiere el ID de la moneda a cotizar
+        options = [option for option in _PARAM_METHODS
+                   if option != 'cotizacion']
+
+        # Ejecuto las solicitudes en un pool de threads de manera que las
+        # esperas de red se superpongan en lugar de sumarse
+        with ThreadPoolExecutor(max_workers=len(options)) as executor:
+            futures = [executor.submit(self.__get_param, option)
+                       for option in options]
+
+        # Obtengo el resultado de cada solicitud para propagar excepciones
+        for future in futures:
+            future.result()
+
+    def __request_param(self):
         """
-        Método genérico que realiza la solicitud según el req_type definido
+        Método genérico que realiza la solicitud a los métodos de AFIP que
+        devuelven parámetros
         """
-        # Métodos soportados por el web service de Factura Electrónica
-        methods = {
-            'solicitar': '',
-            'consultar': 'FECAEAConsultar',
-            'informar_sin_movimiento': 'FECAEASinMovimientoInformar',
-            'consultar_sin_movimiento': 'FECAEASinMovimientoConsultar',
-            'informar_comprobantes': 'FECAEARegInformativo',
-            'ultimo_autorizado': 'FECompUltimoAutorizado',
-            'cantidad_registros': 'FECompTotXRequest',
-            'consultar_comprobante': 'FECompConsultar',
-        }
+        # Obtengo todos los parámetros de forma concurrente si así se solicitó
+        if self.option == 'todos':
+            return self.__request_all_params()
 
-        # Valido el nombre del método solicitado y lo asigno si es válido
-        if self.option not in methods.keys():
+        # Valido el nombre del método solicitado
+        if self.option not in _PARAM_METHODS:
             raise SystemExit('El parámetro no está soportado por el Web '
                              'Service de Factura Electrónica')
-        else:
-            method = methods[self.option]
-
-        # Establezco el lugar donde se almacenan los datos
-        self.set_output_path(output_file=self.option + '.json')
 
-        # Defino los parámetros de autenticación
-        params = {
-            'Auth': {
-                'Token': self.token,
-                'Sign': self.sign,
-                'Cuit': self.cuit
-            }
-        }
+        self.__get_param(self.option)
 
-        # Agrego los parámetros adicionales para el método cotizacion
+    def __request_fe(self):
+        """
+        Método genérico que realiza la solicitud según el req_type definido
+        """
+        from zeep import exceptions
 
-        # Defino los parámetros adicionales según el tipo de requerimiento
-        if req_type == 'FECAESolicitar':
-            extra = {
-                'FeCAEReq': {
-                    'FeCabReq': {
-                        'CantReg': '',
-                        'PtoVta': '',
-                        'CbteTipo': '',
-                    },
-                    'FeDetReq': {
-                        'FECAEDetRequest': {
-                            'Concepto': '',
-                            'DocTipo': '',
-                            'DocNro': '',
-                            'CbteDesde': '',
-                            'CbteHasta': '',
-                            'CbteFch': '',
-                            'ImpTotal': '',
-                            'ImpTotConc': '',
-                            'ImpNeto': '',
-                            'ImpOpEx': '',
-                            'ImpTrib': '',
-                            'ImpIVA': '',
-                            'FchServDesde': '',
-                            'FchServHasta': '',
-                            'FchVtoPago': '',
-                            'MonId': '',
-                            'MonCotiz': '',
-                            'CbtesAsoc': {
-                                'CbteAsoc': {
-                                    'Tipo': '',
-                                    'PtoVta': '',
-                                    'Nro': ''
-                                }
-                            },
-                            'Tributos': {
-                                'Tributo': {
-                                    'Id': '',
-                                    'Desc': '',
-                                    'BaseImp': '',
-                                    'Alic': '',
-                                    'Importe': '',
-                                }
-                            },
-                            'Iva': {
-                                'AlicIva': {
-                                    'Id': '',
-                                    'BaseImp': '',
-                                    'Importe': '',
-                                }
-                            },
-                            'Opcionales': {
-                                'Opcional': {
-                                    'Id': '',
-                                    'Valor': '',
-                                }
-                            }
-                        }
-                    }
-                }
-            }
-        elif req_type == 'FECAEASolicitar' or req_type == 'FECAEAConsultar':
-            extra = {'Periodo': '', 'Orden': ''}
+        # Valido el nombre del método solicitado y lo asigno si es válido
+        method = _FE_METHODS.get(self.option)
+        if method is None:
+            raise SystemExit('El parámetro no está soportado por el Web '
+                             'Service de Factura Electrónica')
 
-        # Actualizo el diccionario de parámetros
-        params.update(extra)
+        # Defino los parámetros de autenticación junto con los parámetros
+        # adicionales que requiere el método solicitado
+        params = {**self._auth_params,
+                  **deepcopy(_FE_EXTRA_TEMPLATES.get(method, {}))}
 
         # Obtengo la respuesta del WSDL de AFIP
         try:
             response = web_service.soap_connect(self.ws_wsdl, method, params)
         except exceptions.Fault as error:
-            raise SystemExit('Error: {} {}'.format(error.code, error.message))
-        '''
-        {
-            'FECAEASinMovimientoInformar': {
-                'PtoVta': '',
-                'CAEA': ''
-            },
-            'FECAEARegInformativo': {
-                'FeCAEARegInfReq': {
-                    'FeCabReq': {
-                        'CantReg': '',
-                        'PtoVta': '',
-                        'CbteTipo': ''
-                    },
-                    'FeDetReq': {
-                        'FECAEADetRequest': {
-                            'Concepto': 'Concepto',
-                            'DocTipo': 'DocTipo',
-                            'DocNro': 'DocNro',
-                            'CbteDesde': 'CbteDesde',
-                            'CbteHasta': 'CbteHasta',
-                            'CbteFch': 'CbteFch',
-                            'ImpTotal': 'ImpTotal',
-                            'ImpTotConc': 'ImpTotConc',
-                            'ImpNeto': 'ImpNeto',
-                            'ImpOpEx': 'ImpOpEx',
-                            'ImpIVA': 'ImpIVA',
-                            'ImpTrib': 'ImpTrib',
-                            'FchServDesde': 'FchServDesde',
-                            'FchServHasta': 'FchServHasta',
-                            'FchVtoPago': 'FchVtoPago',
-                            'MonId': 'MonId',
-                            'MonCotiz': 'MonCotiz',
-                            'CbtesAsoc': {
-                                'CbteAsoc': {
-                                    'Tipo': '',
-                                    'PtoVta': '',
-                                    'Nro': ''
-                                }
-                            },
-                            'Tributos': {
-                                'Tributo': {
-                                    'Id': '',
-                                    'Desc': '',
-                                    'BaseImp': '',
-                                    'Alic': '',
-                                    'Importe': ''
-                                }
-                            },
-                            'Iva': {
-                                'AlicIva': {
-                                    'Id': '',
-                                    'BaseImp': '',
-                                    'Importe': ''
-                                }
-                            },
-                            'Opcionales': {
-                                'Opcional': {
-                                    'Id': '',
-                                    'Valor': ''
-                                }
-                            },
-                            'CAEA': ''
-                        }
-                    }
-                }
-            },
-            'FECAEASinMovimientoConsultar': {
-                'CAEA': '',
-                'PtoVta': ''
-            },
-            'FECompUltimoAutorizado': {
-                'PtoVta': '',
-                'CbteTipo': ''
-            },
-            'FECompConsultar': {
-                'FeCompConsReq': {
-                    'CbteTipo': '',
-                    'CbteNro': '',
-                    'PtoVta': ''
-                }
-            },
-            'FECompTotXRequest': ''
-        }
-        '''
+            raise SystemExit(f'Error: {error.code} {error.message}')
 
     def get_request(self):
         """
@@ -380,19 +449,21 @@ def main():
         utility.print_config(config_data)
 
     # Instancio WSAA para obtener un objeto de autenticación y autorización
+    from wsaa import WSAA
+
     wsaa = WSAA(config_data)
 
     # Instancio WSFE para obtener un objeto de Factura Electrónica AFIP
     voucher = WSFE(config_data)
 
     # Obtengo el ticket de autorización de AFIP
-    voucher.token, voucher.sign = wsaa.get_ticket()
+    voucher.set_credentials(*wsaa.get_ticket())
 
     # Obtengo los datos solicitados
     voucher.get_request()
 
     # Imprimo la ubicación del archivo de salida
-    print('Respuesta AFIP en: {}'.format(voucher.output))
+    print(f'Respuesta AFIP en: {voucher.output}')
 
 
 if __name__ == '__main__':